@@ -1,9 +1,24 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-Dungeon ⇄ Moon Config Editor —  v0.9
+Dungeon ⇄ Moon Config Editor —  v0.10
 Author  : ChatGPT  ·  2025-04-29
 
+New since 0.9
+────────────
+• Workspace mode: Open… accepts several configs, each gets a profile tab and
+  all of them share one interned name table.
+• File ▸ Export / Import Tables… flattens the model into long tables
+  (SQLite, CSV or JSON) and loads them back into the open profile.
+• View ▸ Problems… lists lint findings (malformed pairs, duplicate keys,
+  dangling moons, bad weights, …); kept live as you edit.
+• The open profiles, unsaved edits, tab / mode selection and scroll
+  positions are snapshotted (as JSON) on exit and restored on the next launch
+  (unchanged files are not re-parsed).
+• ui_harness.py drives a scripted session headlessly (fake widget layer or
+  Xvfb) and reports per-step latency & widget counts.
+• View ▸ Compare Moon Across Profiles… lists one moon's weights per profile.
+
 New since 0.8
 ────────────
 • Enemy tab radio-row lets you flip between  *Moon → Enemies*  and
@@ -19,6 +34,7 @@ Requires :  ttkbootstrap  →  pip install ttkbootstrap
 # -------------------------------- PARSER -------------------------------------
 ###############################################################################
 import os, re, sys, platform, tkinter as tk
+import csv, json, sqlite3
 from collections import OrderedDict
 from tkinter import filedialog, messagebox
 
@@ -34,7 +50,29 @@ ENEMY_SUFFIXES = {                       # type  → suffix
     "night"   : " - Nighttime Enemy List =",
 }
 
-def parse_cfg(path):
+def _pairs(val, intern, issues, table, owner, lineno):
+    """
+    Yields (key, weight) for every 'key:weight' in `val`.  Pairs without a
+    ':' and repeated keys are reported into `issues` (if given) as
+    ((code, table, owner, …), message) tuples – see Linter.
+    """
+    seen = set()
+    for pair in (p.strip() for p in val.split(",") if p.strip()):
+        if ":" not in pair:
+            if issues is not None:
+                issues.append((("malformed", table, owner, lineno, pair),
+                               f"Line {lineno}: '{pair}' has no ':weight' (ignored)"))
+            continue
+        key, w = map(intern, map(str.strip, pair.split(":", 1)))
+        if key in seen and issues is not None:
+            issues.append((("duplicate", table, owner, key),
+                           f"Line {lineno}: '{key}' listed twice for {owner} "
+                           f"({table}); last weight wins"))
+        seen.add(key)
+        yield key, w
+
+
+def parse_cfg(path, intern=str, issues=None):
     """
     Returns:
         dmap :  OrderedDict{ dungeon : OrderedDict{moon   : weight} }
@@ -42,6 +80,10 @@ def parse_cfg(path):
         emap :  OrderedDict{  moon   : {type : OrderedDict{enemy : weight}} }
         moons:  OrderedDict{  moon   : bool }
         lines:  list(str)  original file lines
+
+    `intern` is applied to every name & weight (see NameTable) so several
+    configs parsed into one Workspace share their strings.  Malformed pairs
+    and duplicate keys are appended to `issues` when a list is passed.
     """
     dmap, smap, emap, moons = OrderedDict(), OrderedDict(), OrderedDict(), OrderedDict()
     cur_dun = cur_moon = None
@@ -49,17 +91,17 @@ def parse_cfg(path):
     with open(path, encoding="utf-8") as fh:
         lines = fh.readlines()
 
-    for ln in lines:
+    for n, ln in enumerate(lines, 1):
         mdun = SECTION_RE_DUNGEON.match(ln)
         mmoo = SECTION_RE_MOON.match(ln)
 
         if mdun:
-            cur_dun, cur_moon = mdun.group(1).strip(), None
+            cur_dun, cur_moon = intern(mdun.group(1).strip()), None
             dmap.setdefault(cur_dun, OrderedDict())
             continue
 
         if mmoo:
-            cur_moon, cur_dun = mmoo.group(1).strip(), None
+            cur_moon, cur_dun = intern(mmoo.group(1).strip()), None
             moons[cur_moon] = True
             smap.setdefault(cur_moon, OrderedDict())
             emap.setdefault(cur_moon, {t: OrderedDict() for t in ENEMY_SUFFIXES})
@@ -70,10 +112,7 @@ def parse_cfg(path):
             val = ln.split("=", 1)[1].strip()
             if val.lower().startswith("default values"):
                 continue
-            for pair in (p.strip() for p in val.split(",") if p.strip()):
-                if ":" not in pair:
-                    continue
-                moon, w = map(str.strip, pair.split(":", 1))
+            for moon, w in _pairs(val, intern, issues, "dungeon", cur_dun, n):
                 dmap[cur_dun][moon] = w
                 moons.setdefault(moon, False)
 
@@ -82,10 +121,7 @@ def parse_cfg(path):
             val = ln.split("=", 1)[1].strip()
             if val.lower().startswith("default value"):
                 continue
-            for pair in (p.strip() for p in val.split(",") if p.strip()):
-                if ":" not in pair:
-                    continue
-                scrap, w = map(str.strip, pair.split(":", 1))
+            for scrap, w in _pairs(val, intern, issues, "scrap", cur_moon, n):
                 smap[cur_moon][scrap] = w
 
         # moon ⇄ enemies
@@ -95,16 +131,18 @@ def parse_cfg(path):
                     val = ln.split("=", 1)[1].strip()
                     if val.lower().startswith("default value"):
                         break
-                    for pair in (p.strip() for p in val.split(",") if p.strip()):
-                        if ":" not in pair:
-                            continue
-                        enemy, w = map(str.strip, pair.split(":", 1))
+                    for enemy, w in _pairs(val, intern, issues, etype, cur_moon, n):
                         emap[cur_moon][etype][enemy] = w
                     break
 
     return dmap, smap, emap, moons, lines
 
 
+def weight_value(w):
+    """int(w) for a weight made of ASCII digits only, else None."""
+    return int(w) if w and w.isascii() and w.isdigit() else None
+
+
 def build_add_line(dungeon, mapping, indent=""):
     key = f"{dungeon}{ADD_LINE_SUFFIX} "
     val = ",".join(f"{m}:{w}" for m, w in mapping.items()) or "Default Values Were Empty"
@@ -124,10 +162,17 @@ def build_enemy_line(moon, etype, mapping, indent=""):
 
 
 def write_cfg(orig_lines, dmap, smap, emap, out_path):
-    """Re-emit every original line, rewriting only mapping lines."""
+    """
+    Re-emit every original line, rewriting only mapping lines.  A section
+    keeps its dungeon / moon until the next header so every mapping line in
+    it is rewritten (scrap + all three enemy lines); a repeated line of the
+    same kind is dropped (parse_cfg already merged it into the mapping
+    written first).
+    """
     new_lines               = []
     cur_dun = cur_moon      = None
     dun_indent = moon_indent = ""
+    sec_done                = set()          # line kinds rewritten in section
 
     for ln in orig_lines:
         mdun = SECTION_RE_DUNGEON.match(ln)
@@ -136,11 +181,13 @@ def write_cfg(orig_lines, dmap, smap, emap, out_path):
         if mdun:
             cur_dun, cur_moon = mdun.group(1).strip(), None
             dun_indent        = ""
+            sec_done          = set()
             new_lines.append(ln)
             continue
         if mmoo:
             cur_moon, cur_dun = mmoo.group(1).strip(), None
             moon_indent       = ""
+            sec_done          = set()
             new_lines.append(ln)
             continue
 
@@ -150,26 +197,26 @@ def write_cfg(orig_lines, dmap, smap, emap, out_path):
             moon_indent = ln[: len(ln) - len(ln.lstrip())]
 
         if cur_dun and ADD_LINE_SUFFIX in ln and cur_dun in dmap:
-            new_lines.append(build_add_line(cur_dun, dmap[cur_dun], dun_indent))
-            cur_dun = None
+            if "add" not in sec_done:
+                new_lines.append(build_add_line(cur_dun, dmap[cur_dun], dun_indent))
+                sec_done.add("add")
             continue
 
         if cur_moon and SCRAP_LINE_SUFFIX in ln and cur_moon in smap:
-            new_lines.append(build_scrap_line(cur_moon, smap[cur_moon], moon_indent))
-            cur_moon = None
+            if "scrap" not in sec_done:
+                new_lines.append(build_scrap_line(cur_moon, smap[cur_moon], moon_indent))
+                sec_done.add("scrap")
             continue
 
         if cur_moon:
-            replaced = False
-            for etype, suf in ENEMY_SUFFIXES.items():
-                if suf in ln and etype in emap.get(cur_moon, {}):
-                    new_lines.append(build_enemy_line(cur_moon, etype,
-                                                      emap[cur_moon][etype],
+            kind = next((et for et, suf in ENEMY_SUFFIXES.items()
+                         if suf in ln and et in emap.get(cur_moon, {})), None)
+            if kind is not None:
+                if kind not in sec_done:
+                    new_lines.append(build_enemy_line(cur_moon, kind,
+                                                      emap[cur_moon][kind],
                                                       moon_indent))
-                    replaced = True
-                    break
-            if replaced:
-                cur_moon = None
+                    sec_done.add(kind)
                 continue
 
         new_lines.append(ln)
@@ -177,6 +224,606 @@ def write_cfg(orig_lines, dmap, smap, emap, out_path):
     with open(out_path, "w", encoding="utf-8", newline="") as fh:
         fh.writelines(new_lines)
 
+###############################################################################
+# --------------------------------- LINT --------------------------------------
+###############################################################################
+class Linter:
+    """
+    Validation over one Profile's model.  The full check runs once at load
+    (together with parse_cfg's issues) and fills the per-moon totals and
+    per-category enemy counts; afterwards `touch()` updates those by the
+    old → new weight of a single edited cell, so each edit is O(1).
+
+    `issues`:  OrderedDict{ (code, *subject) : message }   with code in
+        malformed · duplicate · dangling · weight · single-category · empty-total
+    Tables are "dungeon" (owner=dungeon, item=moon), "scrap" (owner=moon) or
+    an enemy type (owner=moon).
+    """
+    def __init__(self, prof, parse_issues=()):
+        self.prof   = prof
+        self.issues = OrderedDict()
+        self._line_issues = {}                    # (table, owner) → [keys]
+        self._enemy_cnt   = {t: {} for t in ENEMY_SUFFIXES}   # enemy → #moons
+        self._dun_refs    = {}                    # moon → #dungeon entries
+        self._dun_tot     = {}                    # moon → Σ dungeon weights
+        self._scr_tot     = {}                    # moon → Σ scrap weights
+
+        for key, msg in parse_issues:               # malformed / duplicate
+            self.issues[key] = msg
+            self._line_issues.setdefault(key[1:3], []).append(key)
+
+        # single pass over the model; per-moon totals gathered on the way
+        for dun, mapping in prof.dmap.items():
+            for m, w in mapping.items():
+                self._check_weight("dungeon", dun, m, w)
+                self._dun_refs[m] = self._dun_refs.get(m, 0) + 1
+                self._dun_tot[m]  = self._dun_tot.get(m, 0) + (weight_value(w) or 0)
+        for moon, mapping in prof.smap.items():
+            for s, w in mapping.items():
+                self._check_weight("scrap", moon, s, w)
+                self._scr_tot[moon] = self._scr_tot.get(moon, 0) + (weight_value(w) or 0)
+        for moon, tmap in prof.emap.items():
+            for t, mapping in tmap.items():
+                cnt = self._enemy_cnt[t]
+                for e, w in mapping.items():
+                    self._check_weight(t, moon, e, w)
+                    cnt[e] = cnt.get(e, 0) + 1
+
+        for e in prof.all_enemies:
+            self._check_enemy(e)
+        for m in prof.moons:
+            self._check_moon(m)
+
+    def __len__(self):
+        return len(self.issues)
+
+    def parse_issues(self):
+        """Still-open malformed / duplicate findings."""
+        return [(k, self.issues[k]) for keys in self._line_issues.values()
+                for k in keys if k in self.issues]
+
+    # ------------------------------------------------------------------ snapshot
+    def snapshot(self, sid):
+        """Findings + indexes as JSON data; names go through `sid` (see save_session)."""
+        pos = {k: i for i, k in enumerate(self.issues)}
+        return {
+            "issues": [[list(k), msg] for k, msg in self.issues.items()],
+            "lines":  [[sid(t), sid(o), [pos[k] for k in keys if k in pos]]
+                       for (t, o), keys in self._line_issues.items()],
+            "enemy":  [[[sid(e), n] for e, n in self._enemy_cnt[t].items()]
+                       for t in ENEMY_SUFFIXES],
+            "dun":    [[sid(m), n, self._dun_tot.get(m, 0)]
+                       for m, n in self._dun_refs.items()],
+            "scr":    [[sid(m), v] for m, v in self._scr_tot.items()],
+        }
+
+    @classmethod
+    def restore(cls, snap, names):
+        """Inverse of snapshot() – no model scan; Profile sets `prof`."""
+        self = cls.__new__(cls)
+        self.prof   = None
+        self.issues = OrderedDict((tuple(k), msg) for k, msg in snap["issues"])
+        keys = list(self.issues)
+        self._line_issues = {(names[t], names[o]): [keys[i] for i in ix]
+                             for t, o, ix in snap["lines"]}
+        self._enemy_cnt = {t: {names[e]: n for e, n in cnt}
+                           for t, cnt in zip(ENEMY_SUFFIXES, snap["enemy"])}
+        self._dun_refs  = {names[m]: n for m, n, _ in snap["dun"]}
+        self._dun_tot   = {names[m]: v for m, _, v in snap["dun"]}
+        self._scr_tot   = {names[m]: v for m, v in snap["scr"]}
+        return self
+
+    # ------------------------------------------------------------------ incremental
+    def weight(self, table, owner, item):
+        """Current weight of one cell, None if absent (pass to touch() as `old`)."""
+        return self._mapping(table, owner).get(item)
+
+    def touch(self, table, owner, item, old):
+        """
+        Re-check after `item` was added to / updated in / removed from a line;
+        `old` is its weight before the edit (None if it wasn't there).
+        """
+        # write_cfg regenerates every mapping line of (table, owner) from the
+        # model (repeats dropped), so its malformed / duplicate pairs go away
+        for key in self._line_issues.pop((table, owner), ()):
+            self.issues.pop(key, None)
+
+        new = self.weight(table, owner, item)
+        if new is not None:
+            self._check_weight(table, owner, item, new)
+        else:
+            self.issues.pop(("weight", table, owner, item), None)
+
+        d_val = (weight_value(new) or 0) - (weight_value(old) or 0)
+        d_ref = (new is not None) - (old is not None)
+        if table == "dungeon":
+            self._dun_refs[item] = self._dun_refs.get(item, 0) + d_ref
+            self._dun_tot[item]  = self._dun_tot.get(item, 0) + d_val
+            self._check_moon(item)
+        elif table == "scrap":
+            self._scr_tot[owner] = self._scr_tot.get(owner, 0) + d_val
+            self._check_moon(owner)
+        else:
+            cnt = self._enemy_cnt[table]
+            cnt[item] = cnt.get(item, 0) + d_ref
+            self._check_enemy(item)
+
+    def _mapping(self, table, owner):
+        if table == "dungeon":
+            return self.prof.dmap.get(owner, {})
+        if table == "scrap":
+            return self.prof.smap.get(owner, {})
+        return self.prof.emap.get(owner, {}).get(table, {})
+
+    # ------------------------------------------------------------------ checks
+    def _set(self, key, msg):
+        if msg:
+            self.issues[key] = msg
+        else:
+            self.issues.pop(key, None)
+
+    def _check_weight(self, table, owner, item, w):
+        v   = weight_value(w)
+        msg = None
+        if v is None:
+            msg = f"{owner} ({table}): weight of '{item}' is not an integer: {w!r}"
+        elif v == 0:
+            msg = f"{owner} ({table}): weight of '{item}' is 0"
+        self._set(("weight", table, owner, item), msg)
+
+    def _check_enemy(self, e):
+        cats = [t for t in ENEMY_SUFFIXES if self._enemy_cnt[t].get(e)]
+        self._set(("single-category", e),
+                  f"Enemy '{e}' only appears in the {cats[0]} lists"
+                  if len(cats) == 1 else None)
+
+    def _check_moon(self, m):
+        real = self.prof.moons.get(m)
+        self._set(("dangling", m),
+                  f"Moon '{m}' is referenced by dungeon lines but has no "
+                  f"[Moon: {m}] section"
+                  if real is False and self._dun_refs.get(m) else None)
+        self._set(("empty-total", "dungeon", m),
+                  f"Moon '{m}' has a dungeon weight total of 0"
+                  if real and not self._dun_tot.get(m) else None)
+        self._set(("empty-total", "scrap", m),
+                  f"Moon '{m}' has a scrap weight total of 0"
+                  if real and not self._scr_tot.get(m) else None)
+
+###############################################################################
+# ------------------------------- WORKSPACE -----------------------------------
+###############################################################################
+class NameTable:
+    """
+    Intern pool shared by every profile of a Workspace.  Moon, dungeon,
+    scrap & enemy names (and weight strings) resolve to one object each.
+    Only the strings are shared: every profile still holds its own mapping
+    dicts and its raw lines, so memory does grow with the number of files.
+    """
+    def __init__(self):
+        self._pool = {}
+
+    def __call__(self, s):
+        return self._pool.setdefault(s, s)
+
+    def __len__(self):
+        return len(self._pool)
+
+    def reset(self, names):
+        """Replace the pool with `names` (e.g. read from a session snapshot)."""
+        self._pool = {s: s for s in names}
+
+    def retain(self, profiles):
+        """Drop every string no longer referenced by `profiles`."""
+        self._pool = {}
+        for prof in profiles:
+            for dun, mapping in prof.dmap.items():
+                self(dun)
+                for m, w in mapping.items():
+                    self(m), self(w)
+            for moon in prof.moons:
+                self(moon)
+                for s, w in prof.smap.get(moon, {}).items():
+                    self(s), self(w)
+                for mapping in prof.emap.get(moon, {}).values():
+                    for e, w in mapping.items():
+                        self(e), self(w)
+
+
+def enemy_universe(emap):
+    """Returns ({type : set(enemy)}, set(all enemies)) for one emap."""
+    enemy_un = {t: set() for t in ENEMY_SUFFIXES}
+    for moon in emap:
+        for t in ENEMY_SUFFIXES:
+            enemy_un[t].update(emap[moon].get(t, {}).keys())
+    return enemy_un, set().union(*enemy_un.values())
+
+
+class Profile:
+    """One open config: parsed model + the original lines for write-back."""
+    def __init__(self, path, dmap, smap, emap, moons, lines, parse_issues=(),
+                 fingerprint=None, linter=None):
+        self.path  = path
+        self.lines = lines
+        self.fingerprint = fingerprint            # file_fingerprint() at parse
+        self.dirty = False                        # edits not yet saved
+        self.reset(dmap, smap, emap, moons, parse_issues, linter)
+
+    def reset(self, dmap, smap, emap, moons, parse_issues=(), linter=None):
+        """
+        Swap in a new model (e.g. after a table import); lines are kept.
+        `linter` is a Linter.restore()d one matching the model, else a full
+        check runs.
+        """
+        self.dmap  = dmap
+        self.smap  = smap
+        self.emap  = emap
+        self.moons = moons
+        self.enemy_un, self.all_enemies = enemy_universe(emap)
+        if linter is None:
+            linter = Linter(self, parse_issues)
+        linter.prof = self
+        self.linter = linter
+
+    @property
+    def name(self):
+        return os.path.basename(self.path)
+
+
+class Workspace:
+    """N configs kept open at once, all interning through one NameTable."""
+    def __init__(self):
+        self.names    = NameTable()
+        self.profiles = OrderedDict()          # abs path → Profile
+
+    def open(self, path):
+        path = os.path.abspath(path)
+        if path not in self.profiles:
+            issues = []
+            fp     = file_fingerprint(path)
+            model  = parse_cfg(path, self.names, issues)
+            self.profiles[path] = Profile(path, *model, parse_issues=issues,
+                                          fingerprint=fp)
+        return self.profiles[path]
+
+    def close(self, path):
+        if self.profiles.pop(path, None) is not None:
+            self.names.retain(self.profiles.values())
+
+    def labels(self):
+        """{path : shortest trailing part of the path unique among profiles}"""
+        parts = {p: p.split(os.sep) for p in self.profiles}
+        out   = OrderedDict()
+        for p, ps in parts.items():
+            for k in range(1, len(ps) + 1):
+                tail = ps[-k:]
+                if not any(q != p and qs[-k:] == tail for q, qs in parts.items()):
+                    break
+            out[p] = "/".join(tail).lstrip("/")
+        return out
+
+    def all_moons(self):
+        """Union of real ([Moon: …] section) moons, in first-seen order."""
+        out = OrderedDict()
+        for prof in self.profiles.values():
+            for m, real in prof.moons.items():
+                if real:
+                    out.setdefault(m, True)
+        return list(out)
+
+    def moon_across(self, moon):
+        """
+        Cross-file view of one moon.
+        Returns OrderedDict{ (kind, item) : OrderedDict{path : weight} }
+        with kind ∈ "dungeon", "scrap", "interior", "day", "night".
+        """
+        rows = OrderedDict()
+        for path, prof in self.profiles.items():
+            for dun, mapping in prof.dmap.items():
+                if moon in mapping:
+                    rows.setdefault(("dungeon", dun), OrderedDict())[path] = mapping[moon]
+            for scrap, w in prof.smap.get(moon, {}).items():
+                rows.setdefault(("scrap", scrap), OrderedDict())[path] = w
+            for etype, mapping in prof.emap.get(moon, {}).items():
+                for enemy, w in mapping.items():
+                    rows.setdefault((etype, enemy), OrderedDict())[path] = w
+        return rows
+
+###############################################################################
+# ---------------------------- EXPORT / IMPORT --------------------------------
+###############################################################################
+TABLES = OrderedDict([         # long table → columns after `profile` (abs path)
+    ("dungeon_moon", ("dungeon", "moon", "weight")),
+    ("moon_scrap",   ("moon", "scrap", "weight")),
+    ("moon_enemy",   ("moon", "category", "enemy", "weight")),
+])
+
+
+def model_rows(prof):
+    """Returns {table : generator of rows} flattening dmap / smap / emap."""
+    return {
+        "dungeon_moon": ((d, m, w) for d, mp in prof.dmap.items()
+                                   for m, w in mp.items()),
+        "moon_scrap":   ((m, s, w) for m, mp in prof.smap.items()
+                                   for s, w in mp.items()),
+        "moon_enemy":   ((m, t, e, w) for m, tmap in prof.emap.items()
+                                      for t, mp in tmap.items()
+                                      for e, w in mp.items()),
+    }
+
+
+def model_from_rows(rows, template, intern=str):
+    """
+    Rebuild (dmap, smap, emap, moons) from long-table rows.  Every dungeon
+    and moon of `template` starts out empty so rows missing from the tables
+    clear the matching .cfg line on write-back.  Rows for a dungeon or moon
+    without a section in `template` could never be written back, so they
+    raise ValueError instead of being dropped.
+    """
+    dmap  = OrderedDict((d, OrderedDict()) for d in template.dmap)
+    smap  = OrderedDict((m, OrderedDict()) for m in template.smap)
+    emap  = OrderedDict((m, {t: OrderedDict() for t in ENEMY_SUFFIXES})
+                        for m in template.emap)
+    moons = OrderedDict((m, r) for m, r in template.moons.items() if r)
+    unknown = OrderedDict()                   # "Dungeon: X" / "Moon: Y" → True
+
+    for d, m, w in rows["dungeon_moon"]:
+        if d not in dmap:
+            unknown[f"Dungeon: {d}"] = True
+            continue
+        m = intern(m)
+        dmap[d][m] = intern(str(w))
+        moons.setdefault(m, False)
+    for m, s, w in rows["moon_scrap"]:
+        if m not in smap:
+            unknown[f"Moon: {m}"] = True
+            continue
+        smap[m][intern(s)] = intern(str(w))
+    for m, t, e, w in rows["moon_enemy"]:
+        if t not in ENEMY_SUFFIXES:
+            raise ValueError(f"Unknown enemy category {t!r} for moon {m!r}")
+        if m not in emap:
+            unknown[f"Moon: {m}"] = True
+            continue
+        emap[m][t][intern(e)] = intern(str(w))
+
+    if unknown:
+        raise ValueError("These sections are not in the open config, so their "
+                         "rows cannot be written back:\n  "
+                         + "\n  ".join(unknown))
+    return dmap, smap, emap, moons
+
+
+def _pick_profile(keys, profile):
+    """
+    The stored profile key for `profile` (an absolute path): an exact match,
+    else the only key present, else the single key sharing the longest
+    trailing path with it (tables exported on another machine).
+    """
+    keys = set(keys)
+    if profile in keys:
+        return profile
+    if len(keys) == 1:
+        return next(iter(keys))
+    if not keys:
+        raise ValueError("No rows found")
+
+    want = re.split(r"[\\/]", profile)[::-1]
+    def shared(key):
+        n = 0
+        for a, b in zip(re.split(r"[\\/]", key)[::-1], want):
+            if a != b:
+                break
+            n += 1
+        return n
+    scores = {k: shared(k) for k in keys}
+    best   = max(scores.values())
+    hits   = [k for k, n in scores.items() if n == best]
+    if best and len(hits) == 1:
+        return hits[0]
+    raise ValueError(f"No rows for profile {profile!r} "
+                     f"(found: {', '.join(sorted(keys))})")
+
+
+# ---------------------------------------------------------------- SQLite
+def export_sqlite(db_path, profiles):
+    """
+    Replace each profile's rows in `db_path`; one transaction for all.
+    Weights are stored as TEXT exactly as written in the .cfg ("010" stays
+    "010"); use CAST(weight AS INTEGER) for arithmetic.
+    """
+    con = sqlite3.connect(db_path)
+    try:
+        with con:
+            for table, cols in TABLES.items():
+                decl = ", ".join(f"{c} TEXT" if c == "weight" else f"{c} TEXT NOT NULL"
+                                 for c in cols)
+                con.execute(f"CREATE TABLE IF NOT EXISTS {table} "
+                            f"(profile TEXT NOT NULL, {decl})")
+                for c in ("profile",) + cols[:-1]:
+                    con.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_{c} "
+                                f"ON {table} ({c})")
+
+            for prof in profiles:
+                for table, rows in model_rows(prof).items():
+                    marks = ",".join("?" * (len(TABLES[table]) + 1))
+                    con.execute(f"DELETE FROM {table} WHERE profile = ?", (prof.path,))
+                    con.executemany(f"INSERT INTO {table} VALUES ({marks})",
+                                    ((prof.path,) + r for r in rows))
+    finally:
+        con.close()
+
+
+def import_sqlite(db_path, profile):
+    con = sqlite3.connect(db_path)
+    try:
+        keys = [r[0] for r in con.execute(
+                "SELECT DISTINCT profile FROM dungeon_moon UNION "
+                "SELECT DISTINCT profile FROM moon_scrap UNION "
+                "SELECT DISTINCT profile FROM moon_enemy")]
+        key  = _pick_profile(keys, profile)
+        return {table: con.execute(f"SELECT {', '.join(cols)} FROM {table} "
+                                   f"WHERE profile = ? ORDER BY rowid",
+                                   (key,)).fetchall()
+                for table, cols in TABLES.items()}
+    finally:
+        con.close()
+
+
+# ---------------------------------------------------------------- CSV
+def csv_stem(path):
+    """'out.moon_scrap.csv' / 'out.csv' → 'out'."""
+    stem = path[:-4] if path.lower().endswith(".csv") else path
+    for table in TABLES:
+        if stem.endswith("." + table):
+            return stem[: -len(table) - 1]
+    return stem
+
+
+def export_csv(stem, prof):
+    """Writes <stem>.<table>.csv for every long table."""
+    for table, rows in model_rows(prof).items():
+        with open(f"{stem}.{table}.csv", "w", encoding="utf-8", newline="") as fh:
+            wr = csv.writer(fh)
+            wr.writerow(("profile",) + TABLES[table])
+            wr.writerows((prof.path,) + r for r in rows)
+
+
+def import_csv(stem, profile):
+    grouped = {}                              # table → {profile key : rows}
+    for table, cols in TABLES.items():
+        grouped[table] = by_key = OrderedDict()
+        with open(f"{stem}.{table}.csv", encoding="utf-8", newline="") as fh:
+            for rec in csv.DictReader(fh):
+                by_key.setdefault(rec.get("profile", ""), []).append(
+                    tuple(rec[c] for c in cols))
+    key = _pick_profile(set().union(*grouped.values()), profile)
+    return {table: by_key.get(key, []) for table, by_key in grouped.items()}
+
+
+# ---------------------------------------------------------------- JSON
+def export_json(path, prof):
+    doc = {"profile": prof.path}
+    for table, rows in model_rows(prof).items():
+        doc[table] = recs = [dict(zip(TABLES[table], r)) for r in rows]
+        for rec in recs:      # numbers only where int → str gives it back
+            w = rec["weight"]
+            if w.isascii() and w.isdigit() and str(int(w)) == w:
+                rec["weight"] = int(w)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(doc, fh, indent=1)
+
+
+def import_json(path):
+    with open(path, encoding="utf-8") as fh:
+        doc = json.load(fh)
+    return {table: [tuple(rec[c] for c in cols) for rec in doc.get(table, [])]
+            for table, cols in TABLES.items()}
+
+###############################################################################
+# -------------------------------- SESSION ------------------------------------
+###############################################################################
+SESSION_PATH    = os.path.join(os.path.expanduser("~"), ".moondungeon_session")
+SESSION_VERSION = 3
+
+
+def file_fingerprint(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def _flat(mapping, sid):
+    """OrderedDict{name : weight} → [id, id, …] (see save_session)."""
+    return [sid(x) for kv in mapping.items() for x in kv]
+
+
+def _unflat(ids, names):
+    it = (names[i] for i in ids)
+    return OrderedDict(zip(it, it))
+
+
+def save_session(path, workspace, ui):
+    """
+    Write every open profile (model, lint findings & indexes, unsaved
+    edits) plus the plain `ui` dict as compact JSON.  Names & weights are
+    stored once in a "names" list and referenced by index everywhere else.
+    The original lines are only stored for dirty profiles; clean ones
+    re-read their file.  Data only – no pickle, so a tampered snapshot
+    can't run code on startup.
+    """
+    ids = {}
+    sid = lambda s: ids.setdefault(s, len(ids))
+    profiles = [{
+        "path":        p.path,
+        "fingerprint": list(p.fingerprint or ()),
+        "dirty":       p.dirty,
+        "dmap":  [[sid(d), _flat(mp, sid)] for d, mp in p.dmap.items()],
+        "smap":  [[sid(m), _flat(mp, sid)] for m, mp in p.smap.items()],
+        "emap":  [[sid(m), [_flat(tmap.get(t, {}), sid) for t in ENEMY_SUFFIXES]]
+                  for m, tmap in p.emap.items()],
+        "moons": [[sid(m), r] for m, r in p.moons.items()],
+        "lines": p.lines if p.dirty else None,
+        "lint":  p.linter.snapshot(sid),
+    } for p in workspace.profiles.values()]
+
+    doc = {"version": SESSION_VERSION, "names": list(ids),
+           "profiles": profiles, "ui": ui}
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(doc, fh, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def load_session(path, workspace):
+    """
+    Re-open a saved session into an empty `workspace`.  Profiles whose file
+    still has the same fingerprint come straight from the snapshot, unsaved
+    edits included; changed files are re-parsed.
+    Returns (ui dict, list of warning strings).
+    """
+    with open(path, encoding="utf-8") as fh:
+        doc = json.load(fh)
+    if not isinstance(doc, dict) or doc.get("version") != SESSION_VERSION:
+        return {}, []
+
+    names = doc["names"]
+    workspace.names.reset(names)
+    notes = []
+    for rec in doc["profiles"]:
+        p    = rec["path"]
+        name = os.path.basename(p)
+        try:
+            cur = file_fingerprint(p)
+        except OSError:
+            notes.append(f"{name}: file no longer exists, profile dropped")
+            continue
+        if cur != tuple(rec["fingerprint"]):
+            if rec["dirty"]:
+                notes.append(f"{name}: changed on disk, unsaved edits discarded")
+            try:
+                workspace.open(p)
+            except Exception as e:
+                notes.append(f"{name}: {e}")
+            continue
+
+        dmap  = OrderedDict((names[d], _unflat(f, names)) for d, f in rec["dmap"])
+        smap  = OrderedDict((names[m], _unflat(f, names)) for m, f in rec["smap"])
+        emap  = OrderedDict((names[m], {t: _unflat(f, names)
+                                        for t, f in zip(ENEMY_SUFFIXES, fs)})
+                            for m, fs in rec["emap"])
+        moons = OrderedDict((names[m], bool(r)) for m, r in rec["moons"])
+        lines = rec["lines"]
+        if lines is None:                       # clean: file is unchanged
+            with open(p, encoding="utf-8") as fh:
+                lines = fh.readlines()
+        prof = Profile(p, dmap, smap, emap, moons, lines, fingerprint=cur,
+                       linter=Linter.restore(rec["lint"], names))
+        prof.dirty = bool(rec["dirty"])
+        workspace.profiles[p] = prof
+    if len(workspace.profiles) != len(doc["profiles"]) or notes:
+        workspace.names.retain(workspace.profiles.values())
+    return doc.get("ui", {}), notes
+
 ###############################################################################
 # -------------------------------- UI  ----------------------------------------
 ###############################################################################
@@ -246,7 +893,7 @@ class ScrollPane(ttkb.Frame):
 
 class ConfigEditor(ttkb.Window):
     """Main application window."""
-    def __init__(self):
+    def __init__(self, session_path=SESSION_PATH):
         super().__init__(themename="darkly")
 
         # ───────── Window basics
@@ -256,6 +903,9 @@ class ConfigEditor(ttkb.Window):
         self.style.configure(".", font=(FONT_FAMILY, FONT_SIZE))
 
         # ───────── Data
+        self.workspace = Workspace()
+        self.profile   = None
+        self.profile_tabs = OrderedDict()                # path → tab frame
         self.cfg_path  = None
         self.lines     = []
         self.dmap      = OrderedDict()
@@ -269,6 +919,7 @@ class ConfigEditor(ttkb.Window):
         self.view      = tk.StringVar(value="dungeon")   # active tab
         self.enemy_cat = tk.StringVar(value="interior")  # interior/day/night
         self.enemy_mode = tk.StringVar(value="moon")     # moon vs enemy primary
+        self.session_path = session_path                 # None → no snapshot
 
         # ───────── Custom styles
         self._create_styles()
@@ -278,6 +929,8 @@ class ConfigEditor(ttkb.Window):
         self._build_layout()
 
         self.bind_all("<F2>", lambda *_: self._toggle_mode())
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._restore_session()
 
     # ════════════════════════════════════════════════════════════════════════
     #   STYLE
@@ -312,13 +965,27 @@ class ConfigEditor(ttkb.Window):
         fm = tk.Menu(mb, tearoff=False)
         fm.add_command(label="Open…",      accelerator="Ctrl+O", command=self.open_cfg)
         fm.add_command(label="Save As…",   accelerator="Ctrl+S", command=self.save_cfg)
+        fm.add_command(label="Close Profile", accelerator="Ctrl+W",
+                       command=self.close_profile)
+        fm.add_separator()
+        fm.add_command(label="Export Tables…", command=self.export_tables)
+        fm.add_command(label="Export Workspace to SQLite…",
+                       command=self.export_workspace)
+        fm.add_command(label="Import Tables…", command=self.import_tables)
         fm.add_separator()
-        fm.add_command(label="Exit", command=self.destroy)
+        fm.add_command(label="Exit", command=self._on_close)
         mb.add_cascade(label="File", menu=fm)
 
+        vm = tk.Menu(mb, tearoff=False)
+        vm.add_command(label="Compare Moon Across Profiles…",
+                       command=self._show_moon_compare)
+        vm.add_command(label="Problems…", command=self._show_problems)
+        mb.add_cascade(label="View", menu=vm)
+
         self.config(menu=mb)
         self.bind_all("<Control-o>", lambda *_: self.open_cfg())
         self.bind_all("<Control-s>", lambda *_: self.save_cfg())
+        self.bind_all("<Control-w>", lambda *_: self.close_profile())
 
     # ════════════════════════════════════════════════════════════════════════
     #   LAYOUT
@@ -327,11 +994,17 @@ class ConfigEditor(ttkb.Window):
         self.columnconfigure(0, weight=0)
         self.columnconfigure(1, weight=1)
         self.columnconfigure(2, weight=0)
-        self.rowconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        # ── PROFILE tabs (one per open config) ──────────────────────────────
+        self.profile_nb = ttkb.Notebook(self, bootstyle=SECONDARY)
+        self.profile_nb.grid(row=0, column=0, columnspan=3, sticky="ew",
+                             padx=6, pady=(6, 0))
+        self.profile_nb.bind("<<NotebookTabChanged>>", self._on_profile_changed)
 
         # ── LEFT panel (primary list) ───────────────────────────────────────
         left = ttkb.Frame(self, padding=6)
-        left.grid(row=0, column=0, sticky="nsw")
+        left.grid(row=1, column=0, sticky="nsw")
         left.rowconfigure(2, weight=1)
 
         self.radiobox = ttkb.Frame(left)
@@ -348,7 +1021,7 @@ class ConfigEditor(ttkb.Window):
 
         # ── NOTEBOOK (mid + summary columns) ────────────────────────────────
         self.nb = ttkb.Notebook(self)
-        self.nb.grid(row=0, column=1, sticky="nsew", padx=(6, 0))
+        self.nb.grid(row=1, column=1, sticky="nsew", padx=(6, 0))
         self.nb.bind("<<NotebookTabChanged>>", self._on_tab_changed)
 
         # Tab 1 – Dungeons
@@ -371,7 +1044,13 @@ class ConfigEditor(ttkb.Window):
                                     bootstyle=SUCCESS,
                                     command=self.save_cfg,
                                     state=DISABLED)
-        self.save_btn.grid(row=1, column=2, pady=6, padx=12, sticky="e")
+        self.save_btn.grid(row=2, column=2, pady=6, padx=12, sticky="e")
+
+        # PROBLEMS counter (click → list)
+        self.lint_lbl = ttkb.Label(self, text="", bootstyle=WARNING, cursor="hand2")
+        self.lint_lbl.grid(row=2, column=0, columnspan=2, padx=12, sticky="w")
+        self.lint_lbl.bind("<Button-1>", lambda *_: self._show_problems())
+        self._lint_tree = None
 
     # ------------------------------------------------------------------ generic tab
     def _build_tab(self, parent, tid):
@@ -586,9 +1265,11 @@ class ConfigEditor(ttkb.Window):
     # ════════════════════════════════════════════════════════════════════════
     def _add_update(self, primary, secondary, var):
         w = var.get().strip()
-        if not w.isdigit() or int(w) <= 0:
+        if not weight_value(w):
             messagebox.showerror("Weight error", "Weight must be a positive integer")
             return
+        w   = self.workspace.names(w)
+        old = self.profile.linter.weight(*self._cell(primary, secondary))
 
         view = self.view.get()
 
@@ -610,9 +1291,10 @@ class ConfigEditor(ttkb.Window):
             else:
                 self.dmap[primary][secondary] = w
 
-        self._select_primary(primary)
+        self._after_edit(primary, secondary, old)
 
     def _remove(self, primary, secondary):
+        old  = self.profile.linter.weight(*self._cell(primary, secondary))
         view = self.view.get()
 
         if view == "scrap":
@@ -631,6 +1313,26 @@ class ConfigEditor(ttkb.Window):
             else:
                 self.dmap[primary].pop(secondary, None)
 
+        self._after_edit(primary, secondary, old)
+
+    def _cell(self, primary, secondary):
+        """(table, owner, item) edited by a mid-pane row in the current view."""
+        view = self.view.get()
+        if view == "scrap":
+            return "scrap", primary, secondary
+        if view == "enemy":
+            et = self.enemy_cat.get()
+            if self.enemy_mode.get() == "moon":
+                return et, primary, secondary
+            return et, secondary, primary
+        if self.rel_mode.get() == "moon":
+            return "dungeon", secondary, primary
+        return "dungeon", primary, secondary
+
+    def _after_edit(self, primary, secondary, old):
+        self.profile.dirty = True
+        self.profile.linter.touch(*self._cell(primary, secondary), old)
+        self._refresh_lint()
         self._select_primary(primary)
 
     # ════════════════════════════════════════════════════════════════════════
@@ -657,33 +1359,35 @@ class ConfigEditor(ttkb.Window):
 
         # ---------- SCRAP
         if view == "scrap":
-            rows = [(s, int(w)) for s, w in self.smap.get(primary, {}).items()]
+            rows = list(self.smap.get(primary, {}).items())
             lbl["text"] = "Scrap distribution on this moon"
 
         # ---------- ENEMY
         elif view == "enemy":
             et = self.enemy_cat.get()
             if self.enemy_mode.get() == "moon":
-                rows = [(e, int(w)) for e, w in
-                        self.emap.get(primary, {}).get(et, {}).items()]
+                rows = list(self.emap.get(primary, {}).get(et, {}).items())
                 lbl["text"] = f"{et.capitalize()} enemies on this moon"
             else:
                 # NEW ─ iterate safely over moons that actually exist in emap
                 rows = []
                 for m, typedict in self.emap.items():
                     if primary in typedict.get(et, {}):
-                        rows.append((m, int(typedict[et][primary])))
+                        rows.append((m, typedict[et][primary]))
                 lbl["text"] = f"Moons containing '{primary}' ({et})"
 
         # ---------- DUNGEON
         else:
             if self.rel_mode.get() == "moon":
-                rows = [(d, int(self.dmap[d][primary]))
+                rows = [(d, self.dmap[d][primary])
                         for d in self.dmap if primary in self.dmap[d]]
             else:
-                rows = [(m, int(w)) for m, w in self.dmap[primary].items()]
+                rows = list(self.dmap[primary].items())
             lbl["text"] = "Active dungeons on this moon"
 
+        # non-numeric weights are left out here; the Problems list flags them
+        rows = [(n, weight_value(w)) for n, w in rows]
+        rows = [(n, w) for n, w in rows if w is not None]
         rows.sort(key=lambda x: -x[1])
         total   = sum(w for _, w in rows) or 1
         max_pct = rows[0][1] / total if rows else 1
@@ -706,48 +1410,321 @@ class ConfigEditor(ttkb.Window):
     # ════════════════════════════════════════════════════════════════════════
     #   FILE I/O
     # ════════════════════════════════════════════════════════════════════════
-    def open_cfg(self):
-        p = filedialog.askopenfilename(filetypes=[("Config files", "*.cfg"),
-                                                  ("All files", "*.*")])
-        if not p:
-            return
-        try:
-            self.dmap, self.smap, self.emap, self.moons, self.lines = parse_cfg(p)
-            # build universe of enemies per type + overall union
-            self.enemy_un = {t: set() for t in ENEMY_SUFFIXES}
-            for moon in self.emap:
-                for t in ENEMY_SUFFIXES:
-                    self.enemy_un[t].update(self.emap[moon][t].keys())
-            self.all_enemies = set().union(*self.enemy_un.values())
-        except Exception as e:
-            messagebox.showerror("Parse error", str(e))
+    def open_cfg(self, paths=None):
+        if paths is None:
+            paths = filedialog.askopenfilenames(filetypes=[("Config files", "*.cfg"),
+                                                           ("All files", "*.*")])
+        prof = None
+        for p in paths:
+            try:
+                prof = self.workspace.open(p)
+            except Exception as e:
+                messagebox.showerror("Parse error", f"{p}\n{e}")
+                continue
+            self._add_profile_tab(prof)
+        self._relabel_profile_tabs()
+
+        if prof is not None:
+            self.profile_nb.select(self.profile_tabs[prof.path])
+            self._activate_profile(prof)
+
+    def _add_profile_tab(self, prof):
+        if prof.path not in self.profile_tabs:
+            tab = ttkb.Frame(self.profile_nb)
+            self.profile_nb.add(tab, text=prof.name)
+            self.profile_tabs[prof.path] = tab
+
+    def _relabel_profile_tabs(self):
+        """Same-named configs get enough of their path to tell them apart."""
+        for path, label in self.workspace.labels().items():
+            self.profile_nb.tab(self.profile_tabs[path], text=label)
+
+    def close_profile(self, *_):
+        if self.profile is None:
             return
-
-        self.cfg_path = p
-        self.save_btn["state"] = NORMAL
+        if self.profile.dirty:
+            ans = messagebox.askyesnocancel(
+                "Unsaved changes",
+                f"Save changes to {self.profile.name} before closing?")
+            if ans is None or (ans and not self.save_cfg()):
+                return
+        path = self.profile.path
+        tab  = self.profile_tabs.pop(path)
+        self.profile_nb.forget(tab)
+        tab.destroy()
+        self.workspace.close(path)
+        self._relabel_profile_tabs()
+
+        nxt = next(reversed(self.workspace.profiles.values()), None)
+        if nxt is not None:
+            self.profile_nb.select(self.profile_tabs[nxt.path])
+        self._activate_profile(nxt)
+
+    def _activate_profile(self, prof):
+        """Point the editor's model attributes at `prof` (None → empty)."""
+        self.profile = prof
+        self.selected_primary = None
+        if prof is None:
+            self.cfg_path, self.lines = None, []
+            self.dmap, self.smap = OrderedDict(), OrderedDict()
+            self.emap, self.moons = OrderedDict(), OrderedDict()
+            self.enemy_un, self.all_enemies = enemy_universe(self.emap)
+            self.save_btn["state"] = DISABLED
+            self.title("Dungeon ⇄ Moon Config Editor")
+        else:
+            self.cfg_path, self.lines = prof.path, prof.lines
+            self.dmap, self.smap = prof.dmap, prof.smap
+            self.emap, self.moons = prof.emap, prof.moons
+            self.enemy_un, self.all_enemies = prof.enemy_un, prof.all_enemies
+            self.save_btn["state"] = NORMAL
+            self.title(f"Dungeon ⇄ Moon Config Editor — "
+                       f"{self.workspace.labels()[prof.path]}")
         self._rebuild_primary()
-        self.title(f"Dungeon ⇄ Moon Config Editor — {os.path.basename(p)}")
+        self._refresh_lint()
+
+    def _on_profile_changed(self, *_):
+        sel = self.profile_nb.select()
+        for path, tab in self.profile_tabs.items():
+            if str(tab) == sel:
+                if self.profile is None or self.profile.path != path:
+                    self._activate_profile(self.workspace.profiles[path])
+                return
 
     def save_cfg(self, *_):
+        """Write the active profile; True if a file was written."""
         if not self.cfg_path:
-            return
+            return False
         out = filedialog.asksaveasfilename(defaultextension=".cfg",
                                            filetypes=[("Config files", "*.cfg"),
                                                       ("All files", "*.*")])
         if not out:
-            return
+            return False
         try:
             write_cfg(self.lines, self.dmap, self.smap, self.emap, out)
+            if os.path.abspath(out) == self.profile.path:   # not on Save As
+                self.profile.dirty       = False
+                self.profile.fingerprint = file_fingerprint(out)
             messagebox.showinfo("Saved", f"Wrote {out}")
+            return True
         except Exception as e:
             messagebox.showerror("Write error", str(e))
+            return False
+
+    # ════════════════════════════════════════════════════════════════════════
+    #   TABLE EXPORT / IMPORT
+    # ════════════════════════════════════════════════════════════════════════
+    TABLE_FILETYPES = [("SQLite database", "*.sqlite *.db"),
+                       ("CSV (one file per table)", "*.csv"),
+                       ("JSON", "*.json")]
+
+    def export_tables(self, *_):
+        if self.profile is None:
+            return
+        out = filedialog.asksaveasfilename(defaultextension=".sqlite",
+                                           filetypes=self.TABLE_FILETYPES)
+        if not out:
+            return
+        try:
+            ext     = os.path.splitext(out)[1].lower()
+            written = [out]
+            if ext == ".csv":
+                stem    = csv_stem(out)
+                export_csv(stem, self.profile)
+                written = [f"{stem}.{table}.csv" for table in TABLES]
+            elif ext == ".json":
+                export_json(out, self.profile)
+            else:
+                export_sqlite(out, [self.profile])
+            messagebox.showinfo("Exported", "Wrote " + "\n      ".join(written))
+        except Exception as e:
+            messagebox.showerror("Export error", str(e))
+
+    def export_workspace(self, *_):
+        if not self.workspace.profiles:
+            return
+        out = filedialog.asksaveasfilename(defaultextension=".sqlite",
+                                           filetypes=self.TABLE_FILETYPES[:1])
+        if not out:
+            return
+        try:
+            export_sqlite(out, self.workspace.profiles.values())
+            messagebox.showinfo("Exported",
+                                f"Wrote {len(self.workspace.profiles)} profiles to {out}")
+        except Exception as e:
+            messagebox.showerror("Export error", str(e))
+
+    def import_tables(self, *_):
+        """Load long tables into the active profile; Save As writes the .cfg."""
+        if self.profile is None:
+            return
+        p = filedialog.askopenfilename(filetypes=self.TABLE_FILETYPES +
+                                       [("All files", "*.*")])
+        if not p:
+            return
+        prof = self.profile
+        try:
+            ext = os.path.splitext(p)[1].lower()
+            if ext == ".csv":
+                rows = import_csv(csv_stem(p), prof.path)
+            elif ext == ".json":
+                rows = import_json(p)
+            else:
+                rows = import_sqlite(p, prof.path)
+            prof.reset(*model_from_rows(rows, prof, self.workspace.names))
+        except Exception as e:
+            messagebox.showerror("Import error", str(e))
+            return
+        prof.dirty = True
+        self._activate_profile(prof)
+
+    # ════════════════════════════════════════════════════════════════════════
+    #   PROBLEMS
+    # ════════════════════════════════════════════════════════════════════════
+    def _refresh_lint(self):
+        issues = self.profile.linter.issues if self.profile else {}
+        self.lint_lbl["text"] = f"⚠ {len(issues)} problem(s)" if issues else ""
+
+        tree = self._lint_tree
+        if tree is None or not tree.winfo_exists():
+            return
+        tree.delete(*tree.get_children())
+        for key, msg in issues.items():
+            tree.insert("", "end", values=(key[0], msg))
+
+    def _show_problems(self):
+        if self._lint_tree is not None and self._lint_tree.winfo_exists():
+            self._lint_tree.winfo_toplevel().lift()
+            return
+        top = ttkb.Toplevel(self)
+        top.title("Problems")
+        top.columnconfigure(0, weight=1)
+        top.rowconfigure(0, weight=1)
+
+        tree = ttkb.Treeview(top, columns=("code", "message"), show="headings")
+        tree.heading("code", text="Check")
+        tree.heading("message", text="Message")
+        tree.column("code", width=120)
+        tree.column("message", width=640)
+        tree.grid(row=0, column=0, sticky="nsew", padx=6, pady=6)
+
+        self._lint_tree = tree
+        self._refresh_lint()
+
+    # ════════════════════════════════════════════════════════════════════════
+    #   CROSS-FILE VIEW
+    # ════════════════════════════════════════════════════════════════════════
+    def _show_moon_compare(self):
+        moons = self.workspace.all_moons()
+        if not moons:
+            return
+        sel   = getattr(self, "selected_primary", None)
+        paths = list(self.workspace.profiles)
+        labels = self.workspace.labels()
+
+        top = ttkb.Toplevel(self)
+        top.title("Moon across profiles")
+        top.columnconfigure(0, weight=1)
+        top.rowconfigure(1, weight=1)
+
+        moon_var = tk.StringVar(value=sel if sel in moons else moons[0])
+        ttkb.Combobox(top, textvariable=moon_var, values=moons, state="readonly"
+                      ).grid(row=0, column=0, sticky="w", padx=6, pady=6)
+
+        cols = ["kind"] + [f"p{i}" for i in range(len(paths))]
+        tree = ttkb.Treeview(top, columns=cols, show="tree headings")
+        tree.heading("#0", text="Item")
+        tree.heading("kind", text="Kind")
+        tree.column("kind", width=80, anchor="center")
+        for c, path in zip(cols[1:], paths):
+            tree.heading(c, text=labels[path])
+            tree.column(c, width=110, anchor="center")
+        tree.grid(row=1, column=0, sticky="nsew", padx=6, pady=(0, 6))
+
+        def _fill(*_):
+            tree.delete(*tree.get_children())
+            for (kind, item), per in self.workspace.moon_across(moon_var.get()).items():
+                tree.insert("", "end", text=item,
+                            values=[kind] + [per.get(p, "") for p in paths])
+
+        moon_var.trace_add("write", _fill)
+        _fill()
+
+    # ════════════════════════════════════════════════════════════════════════
+    #   SESSION
+    # ════════════════════════════════════════════════════════════════════════
+    def _relate_pane(self):
+        view = self.view.get()
+        return getattr(self, f"relate_{'en' if view=='enemy' else view[:3]}")
+
+    def _ui_state(self):
+        return {
+            "active":     self.profile.path if self.profile else None,
+            "view":       self.view.get(),
+            "rel_mode":   self.rel_mode.get(),
+            "enemy_mode": self.enemy_mode.get(),
+            "enemy_cat":  self.enemy_cat.get(),
+            "selected":   getattr(self, "selected_primary", None),
+            "scroll":     (self.prime_pane.canvas.yview()[0],
+                           self._relate_pane().canvas.yview()[0]),
+        }
+
+    def _restore_session(self):
+        if not self.session_path or not os.path.exists(self.session_path):
+            return
+        try:
+            ui, notes = load_session(self.session_path, self.workspace)
+        except Exception:                   # unreadable / foreign snapshot
+            self.workspace = Workspace()
+            return
+        if not self.workspace.profiles:
+            return
+
+        for prof in self.workspace.profiles.values():
+            self._add_profile_tab(prof)
+        self._relabel_profile_tabs()
+        for var in ("rel_mode", "enemy_mode", "enemy_cat"):
+            if ui.get(var):
+                getattr(self, var).set(ui[var])
+        view = ui.get("view", "dungeon")
+        self.view.set(view)
+        self.nb.select(("dungeon", "scrap", "enemy").index(view))
+
+        prof = self.workspace.profiles.get(ui.get("active")) \
+               or next(iter(self.workspace.profiles.values()))
+        self.profile_nb.select(self.profile_tabs[prof.path])
+        self._activate_profile(prof)
+
+        sel   = ui.get("selected")
+        panes = [self.prime_pane]
+        if sel in {b.cget("text") for b in self.prime_pane.inner.winfo_children()}:
+            self._select_primary(sel)
+            panes.append(self._relate_pane())    # only filled with a selection
+
+        self.update_idletasks()
+        for pane, y in zip(panes, ui.get("scroll", (0, 0))):
+            pane._sync()
+            pane.canvas.yview_moveto(y)
+
+        if notes:
+            messagebox.showwarning("Session restored", "\n".join(notes))
+
+    def _on_close(self):
+        if self.session_path:
+            try:
+                save_session(self.session_path, self.workspace, self._ui_state())
+            except OSError:
+                pass
+        self.destroy()
 
     # ════════════════════════════════════════════════════════════════════════
     #   MISC
     # ════════════════════════════════════════════════════════════════════════
     def _on_tab_changed(self, *_):
-        idx = self.nb.index(self.nb.select())
-        self.view.set(("dungeon", "scrap", "enemy")[idx])
+        idx  = self.nb.index(self.nb.select())
+        view = ("dungeon", "scrap", "enemy")[idx]
+        if view == self.view.get():         # e.g. tab re-selected on restore
+            return
+        self.view.set(view)
         self._rebuild_primary()
 
     def _toggle_mode(self):
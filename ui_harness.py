@@ -0,0 +1,622 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Headless UI harness for the Dungeon ⇄ Moon Config Editor
+
+Drives a scripted session (open, select, F2, enemy tab / category switches,
+100 weight edits) against a generated config and reports latency and live
+widget count per step, so `_rebuild_primary`, `_populate_secondary`,
+`_refresh_summary` and the `_add_update` / `_remove` flows can be measured
+without a desktop.
+
+Backends
+  fake : a minimal in-process stand-in for tkinter + ttkbootstrap; widgets
+         only record their options, so timings show the editor's own cost.
+  tk   : the real toolkit; uses $DISPLAY or starts Xvfb when it is on PATH.
+  auto : tk when ttkbootstrap and a display (or Xvfb) are available, else fake.
+
+Usage :  python ui_harness.py [--backend auto|fake|tk] [--moons 120] …
+"""
+
+import argparse, json, os, random, select, shutil, subprocess, sys, tempfile, time, types
+
+###############################################################################
+# ------------------------------ FAKE TOOLKIT ---------------------------------
+###############################################################################
+class _Var:
+    _n = 0
+
+    def __init__(self, master=None, value="", name=None):
+        _Var._n += 1
+        self._name  = name or f"PY_VAR{_Var._n}"
+        self._value = value
+        self._traces = []
+
+    def __str__(self):
+        return self._name
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+        for cb in self._traces:
+            cb(self._name, "", "write")
+
+    def trace_add(self, mode, cb):
+        self._traces.append(cb)
+
+
+_pending = []                            # queued (widget, sequence) events
+
+
+class _Widget:
+    """Records options & children; layout calls are no-ops."""
+    created = 0
+
+    def __init__(self, master=None, **kw):
+        _Widget.created += 1
+        self.master    = master
+        self._kw       = dict(kw)
+        self._children = []
+        self._binds    = {}
+        self._alive    = True
+        self._path     = f"{master if master is not None else ''}.w{_Widget.created}"
+        if master is not None:
+            master._children.append(self)
+
+    def __str__(self):
+        return self._path
+
+    # ---------------------------------------------------------------- options
+    def configure(self, **kw):
+        self._kw.update(kw)
+    config = configure
+
+    def cget(self, key):
+        return self._kw.get(key, "")
+
+    def __setitem__(self, key, value):
+        self._kw[key] = value
+
+    def __getitem__(self, key):
+        return self.cget(key)
+
+    # ---------------------------------------------------------------- tree
+    def winfo_children(self):
+        return list(self._children)
+
+    def winfo_toplevel(self):
+        w = self
+        while w.master is not None and not isinstance(w, Toplevel):
+            w = w.master
+        return w
+
+    def winfo_exists(self):
+        return self._alive
+
+    def destroy(self):
+        for c in list(self._children):
+            c.destroy()
+        self._alive = False
+        if self.master is not None and self in self.master._children:
+            self.master._children.remove(self)
+
+    # ---------------------------------------------------------------- events
+    def bind(self, seq, fn, add=None):
+        self._binds[seq] = fn
+
+    def bind_all(self, seq, fn, add=None):
+        self.winfo_toplevel()._binds[seq] = fn
+
+    def unbind_all(self, seq):
+        self.winfo_toplevel()._binds.pop(seq, None)
+
+    def _fire(self, seq):
+        """Queue like Tk does for virtual events; update() delivers them."""
+        _pending.append((self, seq))
+
+    def update(self):
+        while _pending:
+            w, seq = _pending.pop(0)
+            if w._alive and seq in w._binds:
+                w._binds[seq](types.SimpleNamespace(widget=w))
+
+    # ---------------------------------------------------------------- no-ops
+    def _noop(self, *a, **kw):
+        pass
+    grid = grid_remove = pack = columnconfigure = rowconfigure = lift = _noop
+    update_idletasks = _noop
+
+
+class Frame(_Widget):      pass
+class Label(_Widget):      pass
+
+
+class Scrollbar(_Widget):
+    def set(self, first, last):
+        pass
+
+
+class Button(_Widget):
+    def invoke(self):
+        if self._kw.get("command"):
+            return self._kw["command"]()
+
+
+class Radiobutton(Button):
+    def invoke(self):
+        self._kw["variable"].set(self._kw["value"])
+        return super().invoke()
+
+
+class Entry(_Widget):
+    def __init__(self, master=None, **kw):
+        super().__init__(master, **kw)
+        self._var = kw.get("textvariable") or _Var()
+
+    def get(self):
+        return self._var.get()
+
+    def delete(self, first, last=None):
+        self._var.set("")
+
+    def insert(self, index, text):
+        self._var.set(self._var.get() + text)
+
+
+class Combobox(Entry):     pass
+
+
+class Canvas(_Widget):
+    def create_window(self, *a, **kw):
+        return 1
+
+    def itemconfigure(self, *a, **kw):
+        pass
+
+    def bbox(self, *a):
+        return (0, 0, 0, 0)
+
+    def yview(self, *a):
+        return (0.0, 1.0)
+
+    def yview_moveto(self, f):
+        pass
+
+    def yview_scroll(self, n, what):
+        pass
+
+
+class Notebook(_Widget):
+    def __init__(self, master=None, **kw):
+        super().__init__(master, **kw)
+        self._tabs, self._cur = [], None
+
+    def add(self, child, **kw):
+        self._tabs.append(child)
+        if self._cur is None:
+            self.select(child)
+
+    def tab(self, child, **kw):
+        pass
+
+    def forget(self, child):
+        self._tabs.remove(child)
+        if self._cur is child:
+            self._cur = None
+            if self._tabs:
+                self.select(self._tabs[0])
+
+    def index(self, tab):
+        return [str(t) for t in self._tabs].index(str(tab))
+
+    def select(self, tab=None):
+        if tab is None:
+            return str(self._cur) if self._cur is not None else ""
+        if isinstance(tab, int):
+            tab = self._tabs[tab]
+        if tab is not self._cur:
+            self._cur = tab
+            self._fire("<<NotebookTabChanged>>")
+
+
+class Treeview(_Widget):
+    def __init__(self, master=None, **kw):
+        super().__init__(master, **kw)
+        self._items = []
+
+    def heading(self, *a, **kw):  pass
+    def column(self, *a, **kw):   pass
+
+    def insert(self, parent, index, **kw):
+        self._items.append(kw)
+        return str(len(self._items))
+
+    def get_children(self, item=""):
+        return tuple(str(i + 1) for i in range(len(self._items)))
+
+    def delete(self, *items):
+        self._items = []
+
+
+class Menu(_Widget):
+    def add_command(self, **kw):   pass
+    def add_separator(self):       pass
+    def add_cascade(self, **kw):   pass
+
+
+class _Style:
+    colors = types.SimpleNamespace(dark="#222222", bg="#303030")
+
+    def configure(self, *a, **kw):
+        pass
+
+
+class Toplevel(_Widget):
+    def __init__(self, master=None, **kw):
+        super().__init__(master, **kw)
+        self.style = _Style()
+
+    def title(self, *a):            pass
+    def geometry(self, *a):         pass
+    def minsize(self, *a):          pass
+    def protocol(self, *a):         pass
+    def mainloop(self):             pass
+
+
+class Window(Toplevel):
+    def __init__(self, themename=None, **kw):
+        super().__init__(None, **kw)
+
+
+def install_fake_tk():
+    """Put the stand-in modules in sys.modules before moondungeon imports."""
+    messages = []
+    tk = types.ModuleType("tkinter")
+    tk.StringVar, tk.Canvas, tk.Menu = _Var, Canvas, Menu
+    tk.filedialog = types.ModuleType("tkinter.filedialog")
+    for fn in ("askopenfilename", "askopenfilenames", "asksaveasfilename"):
+        setattr(tk.filedialog, fn, lambda *a, **kw: "")
+    tk.messagebox = types.ModuleType("tkinter.messagebox")
+    for fn in ("showerror", "showinfo", "showwarning"):
+        setattr(tk.messagebox, fn,
+                lambda title, msg, _k=fn, **kw: messages.append((_k, title, msg)))
+    # questions are recorded and answered "Cancel", so nothing is lost
+    tk.messagebox.askyesnocancel = (
+        lambda title, msg, **kw: messages.append(("askyesnocancel", title, msg)))
+
+    ttkb = types.ModuleType("ttkbootstrap")
+    for cls in (Window, Toplevel, Frame, Label, Button, Radiobutton, Entry,
+                Combobox, Notebook, Scrollbar, Treeview):
+        setattr(ttkb, cls.__name__, cls)
+    const = types.ModuleType("ttkbootstrap.constants")
+    for c in ("SUCCESS", "INFO", "DANGER", "WARNING", "SECONDARY",
+              "OUTLINE", "ROUND", "NORMAL", "DISABLED"):
+        setattr(const, c, c.lower())
+    ttkb.constants = const
+
+    sys.modules.update({"tkinter": tk, "tkinter.filedialog": tk.filedialog,
+                        "tkinter.messagebox": tk.messagebox,
+                        "ttkbootstrap": ttkb, "ttkbootstrap.constants": const})
+    return messages
+
+###############################################################################
+# ------------------------------- BACKENDS ------------------------------------
+###############################################################################
+def _has_ttkbootstrap():
+    try:
+        import ttkbootstrap  # noqa: F401
+        return True
+    except Exception:
+        return False
+
+
+def start_display(timeout=10):
+    """
+    Returns an Xvfb process if one had to be started, else None.  Xvfb picks
+    a free display itself and writes its number to -displayfd once it
+    accepts connections; RuntimeError if that doesn't happen in `timeout` s.
+    """
+    if os.environ.get("DISPLAY"):
+        return None
+    if not shutil.which("Xvfb"):
+        raise RuntimeError("no $DISPLAY and Xvfb is not on PATH")
+
+    r, w = os.pipe()
+    log  = tempfile.TemporaryFile()
+    proc = subprocess.Popen(["Xvfb", "-displayfd", str(w), "-nolisten", "tcp",
+                             "-screen", "0", "1600x1000x24"],
+                            pass_fds=(w,), stdout=subprocess.DEVNULL, stderr=log)
+    os.close(w)
+
+    def fail(why):
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        log.seek(0)
+        err = log.read().decode(errors="replace").strip()
+        raise RuntimeError(f"Xvfb {why}" + (f":\n{err}" if err else ""))
+
+    buf, deadline = b"", time.monotonic() + timeout
+    try:
+        while not buf.endswith(b"\n"):
+            left = deadline - time.monotonic()
+            if left <= 0 or not select.select([r], [], [], left)[0]:
+                fail(f"did not report a display within {timeout}s")
+            chunk = os.read(r, 64)
+            if not chunk:                     # write end closed → Xvfb exited
+                fail(f"exited with status {proc.wait()}")
+            buf += chunk
+    finally:
+        os.close(r)
+
+    os.environ["DISPLAY"] = ":" + buf.decode().strip()
+    return proc
+
+
+def pick_backend(name):
+    if name == "auto":
+        ok_display = bool(os.environ.get("DISPLAY")) or bool(shutil.which("Xvfb"))
+        name = "tk" if _has_ttkbootstrap() and ok_display else "fake"
+    return name
+
+###############################################################################
+# ------------------------------ CONFIG GEN -----------------------------------
+###############################################################################
+def gen_cfg(path, dungeons=40, moons=120, scraps=80, enemies=60, seed=1):
+    """Writes a synthetic config in the editor's .cfg format."""
+    rnd     = random.Random(seed)
+    m_names = [f"Moon{i:03d}"    for i in range(moons)]
+    s_names = [f"Scrap{i:03d}"   for i in range(scraps)]
+    e_names = [f"Enemy{i:03d}"   for i in range(enemies)]
+
+    def pairs(names, k):
+        return ",".join(f"{n}:{rnd.randint(1, 300)}" for n in rnd.sample(names, k))
+
+    out = []
+    for d in range(dungeons):
+        name = f"Dungeon{d:03d}"
+        out += [f"[Dungeon: {name}]\n",
+                f"    {name} - Add Dungeon by Planet Name = "
+                f"{pairs(m_names, min(moons, rnd.randint(5, 40)))}\n", "\n"]
+    for m in m_names:
+        out += [f"[Moon: {m}]\n",
+                f"    {m} - Scrap List = {pairs(s_names, min(scraps, rnd.randint(10, 40)))}\n"]
+        for label in ("Interior", "Daytime", "Nighttime"):
+            out.append(f"    {m} - {label} Enemy List = "
+                       f"{pairs(e_names, min(enemies, rnd.randint(3, 15)))}\n")
+        out.append("\n")
+
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.writelines(out)
+
+###############################################################################
+# ------------------------------ MODEL CHECKS ---------------------------------
+###############################################################################
+def check_table_roundtrip(md, cfg, tmp):
+    """
+    Export to JSON, change the first row of every table, import, write_cfg
+    and parse the result again: the written .cfg must carry every change.
+    """
+    prof = md.Workspace().open(cfg)
+    path = os.path.join(tmp, "roundtrip.json")
+    md.export_json(path, prof)
+    with open(path, encoding="utf-8") as fh:
+        doc = json.load(fh)
+    for table in md.TABLES:
+        if doc[table]:
+            rec = doc[table][0]
+            rec["weight"] = str((md.weight_value(str(rec["weight"])) or 0) + 7)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(doc, fh)
+
+    model = md.model_from_rows(md.import_json(path), prof)
+    out   = os.path.join(tmp, "roundtrip.cfg")
+    md.write_cfg(prof.lines, *model[:3], out)
+    back  = md.parse_cfg(out)
+    for name, want, got in zip(("dmap", "smap", "emap"), model, back):
+        if want != got:
+            raise AssertionError(f"table round-trip: {name} differs after write_cfg")
+
+
+LINT_CFG = """\
+[Dungeon: Facility]
+    Facility - Add Dungeon by Planet Name = A:10,junk
+    Facility - Add Dungeon by Planet Name = A:12
+[Moon: A]
+    A - Scrap List = Bolt:20,Bolt:5,nocolon
+    A - Interior Enemy List = Bug:1,oops
+    A - Daytime Enemy List = Default value was empty
+    A - Nighttime Enemy List = Dog:4,Dog:6
+"""
+
+
+def check_lint_writeback(md, tmp):
+    """
+    Edit one cell on every mapping line of a config full of malformed and
+    duplicate pairs; the line findings the Linter dropped must be gone from
+    the written file, and its model findings must match a fresh full pass.
+    """
+    src = os.path.join(tmp, "lint.cfg")
+    with open(src, "w", encoding="utf-8") as fh:
+        fh.write(LINT_CFG)
+    prof = md.Workspace().open(src)
+
+    for table, owner, item, mapping in (
+            ("dungeon",  "Facility", "A",    prof.dmap["Facility"]),
+            ("scrap",    "A",        "Bolt", prof.smap["A"]),
+            ("interior", "A",        "Bug",  prof.emap["A"]["interior"]),
+            ("night",    "A",        "Dog",  prof.emap["A"]["night"])):
+        old = mapping.get(item)
+        mapping[item] = "3"
+        prof.linter.touch(table, owner, item, old)
+
+    out = os.path.join(tmp, "lint_out.cfg")
+    md.write_cfg(prof.lines, prof.dmap, prof.smap, prof.emap, out)
+    issues = []
+    back   = md.Profile(out, *md.parse_cfg(out, issues=issues), parse_issues=issues)
+    if issues:
+        raise AssertionError(f"lint write-back: written file still has {issues}")
+    if (back.dmap, back.smap, back.emap) != (prof.dmap, prof.smap, prof.emap):
+        raise AssertionError("lint write-back: written file disagrees with the model")
+    if set(prof.linter.issues) != set(back.linter.issues):
+        raise AssertionError("lint write-back: incremental findings "
+                             f"{sorted(prof.linter.issues)} != fresh pass "
+                             f"{sorted(back.linter.issues)}")
+
+###############################################################################
+# -------------------------------- HARNESS ------------------------------------
+###############################################################################
+def count_widgets(w):
+    return 1 + sum(count_widgets(c) for c in w.winfo_children())
+
+
+def find_widget(root, cls, text):
+    for c in root.winfo_children():
+        if isinstance(c, cls) and str(c.cget("text")) == text:
+            return c
+        hit = find_widget(c, cls, text)
+        if hit is not None:
+            return hit
+    return None
+
+
+class Harness:
+    def __init__(self, app, ttkb):
+        self.app, self.ttkb = app, ttkb
+        self.results = []                     # (label, ms, widgets)
+
+    def _time(self, fn):
+        t0 = time.perf_counter()
+        fn()
+        self.app.update()                     # flush queued <<…>> events
+        return (time.perf_counter() - t0) * 1000
+
+    def _record(self, label, ms):
+        n = count_widgets(self.app)
+        if not n:
+            raise RuntimeError(f"{label}: no widgets left in the editor")
+        self.results.append((label, ms, n))
+
+    def step(self, label, fn):
+        self._record(label, self._time(fn))
+
+    def click(self, cls, text):
+        w = find_widget(self.app, cls, text)
+        if w is None:
+            raise LookupError(f"no {cls.__name__} labelled {text!r}")
+        w.invoke()
+
+    def first_primary(self):
+        return self.app.prime_pane.inner.winfo_children()[0].invoke()
+
+    def edit_weights(self, n):
+        """Set & submit `n` weights through the mid-pane Entry + Add/Update."""
+        times = []
+        for i in range(n):
+            kids = self.app._relate_pane().inner.winfo_children()
+            rows = [(e, b) for e, b in zip(kids, kids[1:])
+                    if isinstance(e, self.ttkb.Entry)]
+            if not rows:
+                raise LookupError("no weight Entry + Add/Update row in the relation pane")
+            entry, btn = rows[i % len(rows)]
+            entry.delete(0, "end")
+            entry.insert(0, str(1 + i))
+            times.append(self._time(btn.invoke))
+        self._record(f"edit {n} weights (total)", sum(times))
+        self.results.append(("  per edit (mean / max)",
+                             (sum(times) / n, max(times)), None))
+
+    def remove_weights(self, n):
+        times = []
+        for _ in range(n):
+            btn = find_widget(self.app._relate_pane().inner, self.ttkb.Button, "Remove")
+            if btn is None:
+                break
+            times.append(self._time(btn.invoke))
+        if times:
+            self._record(f"remove {len(times)} weights (total)", sum(times))
+
+    def run(self, cfg, edits):
+        B, R = self.ttkb.Button, self.ttkb.Radiobutton
+        self.step("open",                 lambda: self.app.open_cfg([cfg]))
+        self.step("select moon",          self.first_primary)
+        self.step("toggle F2",            self.app._toggle_mode)
+        self.step("select dungeon",       self.first_primary)
+        self.step("scrap tab",            lambda: self.app.nb.select(1))
+        self.step("select moon (scrap)",  self.first_primary)
+        self.step("enemy tab",            lambda: self.app.nb.select(2))
+        self.step("select moon (enemy)",  self.first_primary)
+        self.step("enemy cat → night",    lambda: self.click(R, "Nighttime"))
+        self.step("enemy cat → interior", lambda: self.click(R, "Interior"))
+        self.edit_weights(edits)
+        self.remove_weights(10)
+        self.step("enemy → moons",        lambda: self.click(R, "Enemy → Moons"))
+        self.step("select enemy",         self.first_primary)
+        return self.results
+
+    @staticmethod
+    def report(results, out=sys.stdout):
+        out.write(f"{'step':<30} {'ms':>10} {'widgets':>9}\n")
+        for label, ms, n in results:
+            if isinstance(ms, tuple):
+                ms_txt = f"{ms[0]:.2f} / {ms[1]:.2f}"
+            else:
+                ms_txt = f"{ms:.2f}"
+            out.write(f"{label:<30} {ms_txt:>10} {'' if n is None else n:>9}\n")
+
+###############################################################################
+# MAIN
+###############################################################################
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    ap.add_argument("--backend", choices=("auto", "fake", "tk"), default="auto")
+    ap.add_argument("--cfg", help="existing config to drive (default: generated)")
+    ap.add_argument("--dungeons", type=int, default=40)
+    ap.add_argument("--moons",    type=int, default=120)
+    ap.add_argument("--scraps",   type=int, default=80)
+    ap.add_argument("--enemies",  type=int, default=60)
+    ap.add_argument("--edits",    type=int, default=100)
+    args = ap.parse_args(argv)
+
+    backend  = pick_backend(args.backend)
+    xvfb     = None
+    messages = []
+    if backend == "fake":
+        messages = install_fake_tk()
+    else:
+        xvfb = start_display()
+
+    try:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        import moondungeon
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cfg = args.cfg
+            if not cfg:
+                cfg = os.path.join(tmp, "generated.cfg")
+                gen_cfg(cfg, args.dungeons, args.moons, args.scraps, args.enemies)
+
+            check_table_roundtrip(moondungeon, cfg, tmp)
+            check_lint_writeback(moondungeon, tmp)
+            print("table round-trip & lint write-back: ok")
+
+            app = moondungeon.ConfigEditor(session_path=None)
+            app.update()                      # startup events stay out of "open"
+            try:
+                print(f"backend: {backend}   config: {cfg}")
+                Harness.report(Harness(app, moondungeon.ttkb).run(cfg, args.edits))
+                for kind, title, msg in messages:
+                    print(f"[{kind}] {title}: {msg}")
+            finally:
+                app.destroy()
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+
+    # an error dialog during the run means a step failed in the editor
+    return 1 if any(kind == "showerror" for kind, _, _ in messages) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())